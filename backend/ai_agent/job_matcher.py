@@ -11,7 +11,9 @@ import aiohttp
 from langchain_ollama import OllamaLLM
 import json
 from pydantic import BaseModel, Field
+from typing import List, Optional
 from utils.logger import get_logger
+from utils.state_backend import StateBackend, get_backend
 
 # Set up logger for this module
 logger = get_logger('job_matcher')
@@ -24,13 +26,22 @@ if not os.getenv("OPENAI_API_KEY"):
     warnings.warn("OPENAI_API_KEY not found in environment variables. Some features may be limited.")
     os.environ["OPENAI_API_KEY"] = "dummy_key"  # Set a dummy key for development
 
+DEFAULT_CONVERSATION_ID = "default"
+
+# Only the most recent messages are kept, and a conversation is forgotten
+# once it has been idle for CONVERSATION_TTL seconds
+CONVERSATION_MAX_MESSAGES = int(os.getenv("JOBSEEKER_CONVERSATION_MAX_MESSAGES", "20"))
+CONVERSATION_TTL = int(os.getenv("JOBSEEKER_CONVERSATION_TTL", "3600"))
+
 class SearchInput(BaseModel):
     query: str = Field(..., description="The search query string")
 
 class JobMatcher:
-    def __init__(self, use_ollama=True):
-        self.job_search_api = JobSearchAPI()
-        self.conversation_history = []
+    def __init__(self, use_ollama=True, state: Optional[StateBackend] = None):
+        # Conversation history lives in the shared state backend so any
+        # worker can continue a conversation started on another one
+        self.state = state or get_backend()
+        self.job_search_api = JobSearchAPI(state=self.state)
         try:
             if use_ollama:
                 logger.debug("Initializing Ollama LLM")
@@ -69,15 +80,46 @@ class JobMatcher:
             logger.error(f"Error initializing tools: {e}")
             raise
 
-    def add_to_conversation(self, message: str, sender: str = 'user'):
-        """Add a message to conversation history"""
-        self.conversation_history.append({
+    def _conversation_key(self, conversation_id: Optional[str]) -> str:
+        return f"conversation:{conversation_id or DEFAULT_CONVERSATION_ID}"
+
+    def _conversation_entry(self, message: str, sender: str) -> dict:
+        return {
             'text': message,
             'sender': sender,
             'timestamp': datetime.now().isoformat()
-        })
+        }
+
+    def add_to_conversation(self, message: str, sender: str = 'user', conversation_id: Optional[str] = None):
+        """Add a message to conversation history"""
+        self.state.append(
+            self._conversation_key(conversation_id),
+            self._conversation_entry(message, sender),
+            max_items=CONVERSATION_MAX_MESSAGES,
+            ttl=CONVERSATION_TTL
+        )
+
+    async def aadd_to_conversation(self, message: str, sender: str = 'user', conversation_id: Optional[str] = None):
+        """Add a message to conversation history without blocking the event loop"""
+        await self.state.aappend(
+            self._conversation_key(conversation_id),
+            self._conversation_entry(message, sender),
+            max_items=CONVERSATION_MAX_MESSAGES,
+            ttl=CONVERSATION_TTL
+        )
+
+    def get_conversation(self, conversation_id: Optional[str] = None) -> List[dict]:
+        """Return the message history for a conversation"""
+        return self.state.get_list(self._conversation_key(conversation_id))
+
+    @property
+    def conversation_history(self) -> List[dict]:
+        return self.get_conversation()
 
-    def _search_jobs_impl(self, query: str) -> dict:
+    # The docstring below becomes the tool description shown to the LLM, so
+    # conversation_id is left out of it: the tool schema only exposes query
+    # and /chat passes the id by calling this method directly.
+    def _search_jobs_impl(self, query: str, conversation_id: Optional[str] = None) -> dict:
         """Search for jobs based on the provided query and conversation context.
         
         Args:
@@ -90,18 +132,19 @@ class JobMatcher:
         
         # Add current query to conversation
         logger.debug(f"Adding query to conversation: {query}")
-        self.add_to_conversation(query)
+        self.add_to_conversation(query, conversation_id=conversation_id)
         
         # Extract job parameters from conversation history
-        logger.debug(f"Current conversation history: {self.conversation_history}")
-        params = self.job_search_api.extract_job_params(self.conversation_history)
+        history = self.get_conversation(conversation_id)
+        logger.debug(f"Current conversation history: {history}")
+        params = self.job_search_api.extract_job_params(history)
         logger.debug(f"Extracted job parameters: {params}")
         
         # Run async job search in sync context
         try:
-            loop = asyncio.get_event_loop()
+            # Tools are called from a worker thread with no running loop
             logger.debug("Starting job search")
-            job_results = loop.run_until_complete(
+            job_results = asyncio.run(
                 self.job_search_api.search_all(query, params=params)
             )
             logger.debug(f"Job search results status: {job_results.get('status')}")
@@ -138,7 +181,7 @@ class JobMatcher:
             "search_params": params
         }
 
-    def _refine_search_impl(self, query: str) -> dict:
+    def _refine_search_impl(self, query: str, conversation_id: Optional[str] = None) -> dict:
         """Refine the job search based on user feedback and additional criteria.
         
         Args:
@@ -148,8 +191,8 @@ class JobMatcher:
             dict: A dictionary containing refined search results with job matches and status
         """
         logger.debug(f"Refining search with query: {query}")
-        self.add_to_conversation(query)
-        return self._search_jobs_impl(query)
+        self.add_to_conversation(query, conversation_id=conversation_id)
+        return self._search_jobs_impl(query, conversation_id=conversation_id)
 
     # Create tool properties that return the bound methods
     @property
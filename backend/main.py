@@ -5,8 +5,10 @@ from nltk.tokenize import word_tokenize
 from nltk.tag import pos_tag
 from fastapi.middleware.cors import CORSMiddleware
 import aiohttp
+import asyncio
 import json
 import datetime
+import uuid
 from scripts.job_search import JobSearchAPI
 from ai_agent.job_matcher import build_agent, JobMatcher
 from typing import Optional
@@ -98,7 +100,9 @@ async def chat_message(message: ChatMessage):
     try:
         logger.debug("====== New Chat Message ======")
         logger.debug(f"Received message: {message.message}")
-        logger.debug(f"Conversation ID: {message.conversation_id}")
+        # Give each new session its own history instead of a shared one
+        conversation_id = message.conversation_id or str(uuid.uuid4())
+        logger.debug(f"Conversation ID: {conversation_id}")
         
         # First, get LLM response using JobMatcher's Ollama implementation
         logger.debug("Getting LLM response...")
@@ -107,7 +111,7 @@ async def chat_message(message: ChatMessage):
         
         # Add message to conversation history
         logger.debug("Adding message to conversation history")
-        job_matcher.add_to_conversation(message.message)
+        await job_matcher.aadd_to_conversation(message.message, conversation_id=conversation_id)
         
         # Check for job search intent
         job_related_words = ['job', 'work', 'position', 'hiring', 'career', 'employment']
@@ -117,8 +121,13 @@ async def chat_message(message: ChatMessage):
         if has_job_intent:
             try:
                 logger.debug("Starting job search...")
-                # Use job matcher to find relevant positions
-                results = job_matcher.search_jobs.invoke({"query": message.message})
+                # Use job matcher to find relevant positions. The search is
+                # synchronous, so run it in a thread to keep the loop free.
+                # The conversation id is passed directly rather than through
+                # the tool schema so the LLM never chooses it.
+                results = await asyncio.to_thread(
+                    job_matcher._search_jobs_impl, message.message, conversation_id
+                )
                 logger.debug(f"Job search completed. Status: {results.get('status')}")
                 logger.debug(f"Full results: {json.dumps(results, indent=2)}")
                 
@@ -126,21 +135,23 @@ async def chat_message(message: ChatMessage):
                     # Combine LLM response with job search results
                     logger.debug("Combining LLM response with job results")
                     combined_response = f"{llm_response}\n\nI found some relevant job opportunities:\n\n{results['message']}"
-                    return {"response": combined_response}
+                    return {"response": combined_response, "conversation_id": conversation_id}
                 else:
                     logger.debug("No successful job results, returning prompt for more details")
                     return {
-                        "response": f"{llm_response}\n\nI couldn't find specific job listings matching your criteria. Could you provide more details about what type of position you're looking for?"
+                        "response": f"{llm_response}\n\nI couldn't find specific job listings matching your criteria. Could you provide more details about what type of position you're looking for?",
+                        "conversation_id": conversation_id
                     }
             except Exception as search_error:
                 logger.error(f"Error during job search: {str(search_error)}")
                 return {
-                    "response": f"{llm_response}\n\nI encountered an error while searching for jobs. Please try again with more specific criteria."
+                    "response": f"{llm_response}\n\nI encountered an error while searching for jobs. Please try again with more specific criteria.",
+                    "conversation_id": conversation_id
                 }
         
         # For non-job queries, just return the LLM response
         logger.debug("No job intent detected, returning LLM response only")
-        return {"response": llm_response}
+        return {"response": llm_response, "conversation_id": conversation_id}
         
     except Exception as e:
         logger.error(f"Error in chat_message: {str(e)}")
@@ -158,6 +169,20 @@ async def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    logger.info("Starting FastAPI server...")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from utils.state_backend import BACKEND_ENV
+
+    workers = int(os.getenv("JOBSEEKER_WORKERS", "1"))
+    if workers > 1:
+        # Each worker is a separate process, so state must live in a shared
+        # backend. Set before uvicorn spawns workers so they inherit it.
+        if os.getenv(BACKEND_ENV, "memory").lower() == "memory":
+            logger.warning("In-memory state cannot be shared across workers, using sqlite")
+            os.environ[BACKEND_ENV] = "sqlite"
+        logger.info(f"Starting FastAPI server with {workers} workers...")
+        # uvicorn needs an import string to spawn worker processes
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        logger.info("Starting FastAPI server...")
+        uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,16 +1,266 @@
-import requests
-from bs4 import BeautifulSoup
-
-def scrape_jobs():
-    url = "https://www.example-jobs.com"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
+import argparse
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
+from utils.logger import get_logger
+
+# Set up logger for this module
+logger = get_logger('job_scraper')
+
+# Fields produced for every job, matching JobSearchAPI.search_jsearch
+JOB_FIELDS = ["title", "company", "location", "description", "url",
+              "salary", "source", "posted_date", "job_type"]
+
+FIELD_DEFAULTS = {
+    "salary": "Not specified",
+    "job_type": "Not specified",
+}
+
+# Absolute date formats seen on listing pages, tried after ISO-8601
+DATE_FORMATS = ["%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y"]
+
+RELATIVE_DATE = re.compile(r'(\d+|an?)\s+(minute|hour|day|week|month)s?\s+ago')
+RELATIVE_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+}
+
+
+@dataclass
+class SiteConfig:
+    """Selectors and pagination rules for one job listing site.
+
+    Field selectors are CSS selectors relative to each listing item. Append
+    "@attr" to read an attribute instead of the text, e.g. "a.title@href".
+    Pagination uses exactly one of two modes: a page_url template containing
+    "{page}", whose pages first_page onwards are fetched concurrently, or a
+    start_url whose next_page links (if any) are followed one page at a time.
+    """
+    name: str
+    item: str
+    fields: Dict[str, str]
+    start_url: Optional[str] = None
+    page_url: Optional[str] = None
+    next_page: Optional[str] = None
+    first_page: int = 1
+    max_pages: int = 1
+    defaults: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if bool(self.start_url) == bool(self.page_url):
+            raise ValueError(f"Site {self.name} needs exactly one of start_url or page_url")
+
+
+def load_site_configs(path: str) -> List[SiteConfig]:
+    """Load site configurations from a JSON file containing a list of objects"""
+    with open(path) as f:
+        return [SiteConfig(**site) for site in json.load(f)]
+
+
+def _select_value(node, selector: str, base_url: str) -> str:
+    """Read the text or attribute matched by a selector like "a.title@href" """
+    selector, _, attr = selector.partition("@")
+    match = node.css_first(selector) if selector else node
+    if match is None:
+        return ""
+    if attr:
+        value = (match.attributes.get(attr) or "").strip()
+        return urljoin(base_url, value) if attr in ("href", "src") and value else value
+    return match.text(separator=" ", strip=True)
+
+
+def normalize_posted_date(value: str, now: Optional[datetime] = None) -> str:
+    """Convert a listing date to a UTC ISO-8601 string, or "" if it can't be parsed.
+
+    JobSearchAPI.search_all sorts merged results with datetime.fromisoformat,
+    so every date must be ISO-8601 and timezone-aware like the API results.
+    """
+    value = value.strip()
+    if not value:
+        return ""
+    now = now or datetime.now(timezone.utc)
+
+    parsed = None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        for date_format in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, date_format)
+                break
+            except ValueError:
+                continue
+
+    if parsed is None:
+        text = value.lower()
+        if "today" in text or "just posted" in text:
+            parsed = now
+        elif "yesterday" in text:
+            parsed = now - timedelta(days=1)
+        else:
+            match = RELATIVE_DATE.search(text)
+            if not match:
+                return ""
+            amount = 1 if match.group(1) in ("a", "an") else int(match.group(1))
+            parsed = now - amount * RELATIVE_UNITS[match.group(2)]
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def parse_listing(html: str, site: SiteConfig, page_url: str) -> List[Dict]:
+    """Parse one listing page into jobs in the standard search result format"""
+    tree = LexborHTMLParser(html)
     jobs = []
-    for item in soup.select('.job-listing'):
-        jobs.append({
-            'title': item.select_one('.title').text,
-            'company': item.select_one('.company').text,
-            'description': item.select_one('.desc').text
-        })
-    return jobs
\ No newline at end of file
+    for item in tree.css(site.item):
+        job = {}
+        for name in JOB_FIELDS:
+            selector = site.fields.get(name)
+            value = _select_value(item, selector, page_url) if selector else ""
+            job[name] = value or site.defaults.get(name, FIELD_DEFAULTS.get(name, ""))
+        job["source"] = site.name
+        job["posted_date"] = normalize_posted_date(job["posted_date"])
+        if job["title"]:
+            jobs.append(job)
+    return jobs
+
+
+def find_next_page(html: str, site: SiteConfig, page_url: str) -> Optional[str]:
+    """Return the absolute URL of the next listing page, if the site has one"""
+    if not site.next_page:
+        return None
+    value = _select_value(LexborHTMLParser(html), site.next_page, page_url)
+    if not value:
+        return None
+    return urljoin(page_url, value)
+
+
+class JobScraper:
+    """Crawls job listing pages concurrently with per-host politeness limits."""
+
+    def __init__(self, sites: List[SiteConfig], max_concurrency: int = 10,
+                 per_host_concurrency: int = 2, per_host_delay: float = 1.0,
+                 timeout: float = 30):
+        self.sites = sites
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.timeout = timeout
+        self._pool: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_last_request: Dict[str, float] = {}
+
+    async def _wait_for_host(self, host: str):
+        """Space out requests to the same host by at least per_host_delay"""
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            wait = self._host_last_request.get(host, 0) + self.per_host_delay - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_last_request[host] = time.monotonic()
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        """Fetch a page, reading file:// URLs from disk so saved pages can be parsed"""
+        parsed = urlparse(url)
+        if parsed.scheme == "file":
+            try:
+                with open(url2pathname(parsed.path), encoding="utf-8") as f:
+                    return f.read()
+            except OSError as e:
+                logger.error(f"Error reading {url}: {e}")
+                return None
+
+        if self._pool is None:
+            self._pool = asyncio.Semaphore(self.max_concurrency)
+        host = parsed.netloc
+        slots = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host_concurrency))
+        async with self._pool, slots:
+            await self._wait_for_host(host)
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    return await response.text()
+            except Exception as e:
+                logger.error(f"Error fetching {url}: {e}")
+                return None
+
+    async def _scrape_page(self, session: aiohttp.ClientSession, site: SiteConfig, url: str) -> List[Dict]:
+        html = await self.fetch(session, url)
+        if html is None:
+            return []
+        jobs = parse_listing(html, site, url)
+        logger.debug(f"Scraped {len(jobs)} jobs from {url}")
+        return jobs
+
+    async def scrape_site(self, session: aiohttp.ClientSession, site: SiteConfig) -> List[Dict]:
+        """Scrape every listing page of one site"""
+        if site.page_url:
+            urls = [site.page_url.format(page=page)
+                    for page in range(site.first_page, site.first_page + site.max_pages)]
+            pages = await asyncio.gather(*(self._scrape_page(session, site, url) for url in urls))
+            return [job for page in pages for job in page]
+
+        # Without a page template the next link has to be read from each page
+        jobs = []
+        url, seen = site.start_url, set()
+        while url and url not in seen and len(seen) < site.max_pages:
+            seen.add(url)
+            html = await self.fetch(session, url)
+            if html is None:
+                break
+            jobs.extend(parse_listing(html, site, url))
+            url = find_next_page(html, site, url)
+        return jobs
+
+    async def scrape_all(self) -> List[Dict]:
+        """Scrape all configured sites concurrently and drop duplicate listings"""
+        # Semaphores and locks belong to one event loop, so start fresh each run
+        self._pool = asyncio.Semaphore(self.max_concurrency)
+        self._host_slots.clear()
+        self._host_locks.clear()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(self.scrape_site(session, site) for site in self.sites),
+                return_exceptions=True
+            )
+
+        jobs, seen = [], set()
+        for site, result in zip(self.sites, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error scraping {site.name}: {result}")
+                continue
+            for job in result:
+                key = job["url"] or (job["title"], job["company"], job["location"])
+                if key not in seen:
+                    seen.add(key)
+                    jobs.append(job)
+        return jobs
+
+
+def main():
+    """Command-line entry point; FastAPI code should await JobScraper.scrape_all instead"""
+    parser = argparse.ArgumentParser(description="Scrape job listing sites described in a JSON config")
+    parser.add_argument("config", help="JSON file with a list of site configurations")
+    parser.add_argument("--per-host-delay", type=float, default=1.0)
+    args = parser.parse_args()
+
+    scraper = JobScraper(load_site_configs(args.config), per_host_delay=args.per_host_delay)
+    print(json.dumps(asyncio.run(scraper.scrape_all()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
 from typing import List, Dict, Optional
-import requests
+import aiohttp
 import json
 import os
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 from utils.logger import get_logger
+from utils.state_backend import StateBackend, get_backend
 
 # Set up logger for this module
 logger = get_logger('job_search')
@@ -13,8 +14,17 @@ logger = get_logger('job_search')
 # Load environment variables
 load_dotenv()
 
+# How long search results stay cached, and how many calls each upstream
+# provider may receive per minute across all workers
+SEARCH_CACHE_TTL = int(os.getenv("JOBSEEKER_SEARCH_CACHE_TTL", "300"))
+PROVIDER_RATE_LIMIT = int(os.getenv("JOBSEEKER_PROVIDER_RATE_LIMIT", "30"))
+PROVIDER_RATE_WINDOW = 60
+
 class JobSearchAPI:
-    def __init__(self):
+    def __init__(self, state: Optional[StateBackend] = None):
+        # Shared state for search caches and provider rate limits
+        self.state = state or get_backend()
+
         # Initialize API keys from environment variables
         self.jsearch_key = os.getenv("af5387528dmshcbcc76d1ab0bffdp123390jsn76b3a3037d88")
         self.jooble_key = os.getenv("f1014aa9-bb6d-4f32-892c-cc74417de667")
@@ -30,8 +40,10 @@ class JobSearchAPI:
             'type': r'(full[- ]time|part[- ]time|contract|permanent|remote|hybrid)'
         }
 
-    async def search_jsearch(self, query: str, location: str = "Remote") -> List[Dict]:
-        """Search jobs using JSearch API"""
+    async def search_jsearch(self, query: str, location: str = "Remote") -> Optional[List[Dict]]:
+        """Search jobs using JSearch API. Returns None if the call was skipped or failed."""
+        if not await self._allow_provider("jsearch"):
+            return None
         try:
             url = "https://jsearch.p.rapidapi.com/search"
             querystring = {"query": f"{query}, {location}", "num_pages": "1"}
@@ -40,9 +52,10 @@ class JobSearchAPI:
                 "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
             }
             
-            response = requests.get(url, headers=headers, params=querystring)
-            response.raise_for_status()
-            data = response.json()
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=headers, params=querystring) as response:
+                    response.raise_for_status()
+                    data = await response.json()
             
             # Standardize the response format
             return [{
@@ -59,16 +72,20 @@ class JobSearchAPI:
             
         except Exception as e:
             logger.error(f"JSearch API error: {e}")
-            return []
+            return None
 
-    async def search_remotive(self, query: str) -> List[Dict]:
-        """Search remote jobs using Remotive API"""
+    async def search_remotive(self, query: str) -> Optional[List[Dict]]:
+        """Search remote jobs using Remotive API. Returns None if the call was skipped or failed."""
+        if not await self._allow_provider("remotive"):
+            return None
         try:
-            url = f"https://remotive.io/api/remote-jobs?search={query}&category=software-dev"
+            url = "https://remotive.io/api/remote-jobs"
+            params = {"search": query, "category": "software-dev"}
             
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json()
             
             return [{
                 "title": job["title"],
@@ -84,7 +101,18 @@ class JobSearchAPI:
             
         except Exception as e:
             logger.error(f"Remotive API error: {e}")
-            return []
+            return None
+
+    async def _allow_provider(self, provider: str) -> bool:
+        """Check the shared rate-limit bucket before calling an upstream API"""
+        if await self.state.aallow(f"ratelimit:{provider}", PROVIDER_RATE_LIMIT, PROVIDER_RATE_WINDOW):
+            return True
+        logger.warning(f"Rate limit reached for {provider}, skipping request")
+        return False
+
+    def _cache_key(self, query: str, location: str, params: Optional[Dict]) -> str:
+        """Build a stable cache key for a search request"""
+        return "search:" + json.dumps([query, location, params], sort_keys=True)
 
     def extract_job_params(self, conversation_history: List[Dict]) -> Dict:
         """Extract job search parameters from conversation history"""
@@ -113,6 +141,12 @@ class JobSearchAPI:
 
     async def search_all(self, query: str, location: str = "Remote", params: Dict = None) -> Dict:
         """Enhanced search with additional parameters"""
+        cache_key = self._cache_key(query, location, params)
+        cached = await self.state.aget(cache_key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for query: {query}")
+            return cached
+
         try:
             # Build search query incorporating all parameters
             search_query = query
@@ -133,8 +167,11 @@ class JobSearchAPI:
             jsearch_results = await self.search_jsearch(search_query, search_location)
             remotive_results = await self.search_remotive(search_query)
             
+            # A provider that was skipped or failed returns None
+            complete = jsearch_results is not None and remotive_results is not None
+
             # Combine and filter results
-            all_jobs = jsearch_results + remotive_results
+            all_jobs = (jsearch_results or []) + (remotive_results or [])
             
             # Filter results if we have specific parameters
             if params:
@@ -152,14 +189,9 @@ class JobSearchAPI:
                 all_jobs = filtered_jobs
             
             # Sort by posted date
-            all_jobs.sort(
-                key=lambda x: datetime.fromisoformat(x["posted_date"].replace('Z', '+00:00'))
-                if x["posted_date"]
-                else datetime.min,
-                reverse=True
-            )
+            all_jobs.sort(key=self._posted_date_key, reverse=True)
             
-            return {
+            results = {
                 "status": "success",
                 "total_jobs": len(all_jobs),
                 "jobs": all_jobs,
@@ -171,6 +203,11 @@ class JobSearchAPI:
                     "timestamp": datetime.now().isoformat()
                 }
             }
+            # Only cache when every provider answered, so a rate-limited or
+            # failed provider is queried again on the next request
+            if complete:
+                await self.state.aset(cache_key, results, ttl=SEARCH_CACHE_TTL)
+            return results
             
         except Exception as e:
             return {
@@ -185,6 +222,18 @@ class JobSearchAPI:
                 }
             }
 
+    @staticmethod
+    def _posted_date_key(job: Dict) -> datetime:
+        """Sort key for posted dates; naive dates are treated as UTC and
+        missing or unparseable ones sort last"""
+        try:
+            posted = datetime.fromisoformat(job["posted_date"].replace('Z', '+00:00'))
+        except (KeyError, ValueError):
+            return datetime.min.replace(tzinfo=timezone.utc)
+        if posted.tzinfo is None:
+            posted = posted.replace(tzinfo=timezone.utc)
+        return posted
+
     def _matches_salary(self, job_salary: str, target_salary: str) -> bool:
         """Helper method to match salary ranges"""
         try:
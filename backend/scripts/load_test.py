@@ -0,0 +1,74 @@
+"""Measure /chat throughput and check that conversations survive across workers.
+
+Run against a server started with `just run-backend-workers N`:
+
+    python -m scripts.load_test --url http://localhost:8000 --conversations 20 --messages 10
+
+With --state-path pointing at the server's SQLite state file, the script also
+checks that every message of each conversation was stored in its history,
+whichever worker handled it.
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Optional
+import aiohttp
+from ai_agent.job_matcher import CONVERSATION_MAX_MESSAGES
+from utils.state_backend import SQLiteBackend
+
+
+async def run_conversation(session: aiohttp.ClientSession, url: str, messages: int) -> Optional[str]:
+    """Send messages in one conversation and return its id, or None if it changed"""
+    conversation_id = None
+    for i in range(messages):
+        async with session.post(f"{url}/chat", json={
+            "message": f"hello {i}",
+            "conversation_id": conversation_id
+        }) as response:
+            response.raise_for_status()
+            data = await response.json()
+        if conversation_id is None:
+            conversation_id = data.get("conversation_id")
+        elif data.get("conversation_id") != conversation_id:
+            return None
+    return conversation_id
+
+
+def check_history(state_path: str, conversation_ids: List[str], messages: int) -> int:
+    """Count conversations whose stored history holds every message sent"""
+    backend = SQLiteBackend(state_path)
+    complete = 0
+    for conversation_id in conversation_ids:
+        texts = [entry["text"] for entry in backend.get_list(f"conversation:{conversation_id}")]
+        # Older messages are trimmed once a conversation reaches the cap
+        expected = [f"hello {i}" for i in range(messages)][-CONVERSATION_MAX_MESSAGES:]
+        if texts == expected:
+            complete += 1
+    return complete
+
+
+async def main(url: str, conversations: int, messages: int, state_path: Optional[str]):
+    async with aiohttp.ClientSession() as session:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            run_conversation(session, url, messages) for _ in range(conversations)
+        ))
+        elapsed = time.perf_counter() - start
+
+    total = conversations * messages
+    print(f"{total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+    conversation_ids = [result for result in results if result]
+    print(f"{len(conversation_ids)}/{conversations} conversations kept their id")
+    if state_path:
+        complete = check_history(state_path, conversation_ids, messages)
+        print(f"{complete}/{conversations} conversations have their full history stored")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=10)
+    parser.add_argument("--state-path", help="SQLite state file used by the server")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.conversations, args.messages, args.state_path))
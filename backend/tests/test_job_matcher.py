@@ -0,0 +1,35 @@
+from ai_agent.job_matcher import JobMatcher, build_agent
+from utils.state_backend import InMemoryBackend
+
+
+def test_tools_only_expose_query():
+    matcher = JobMatcher(state=InMemoryBackend())
+    for tool in (matcher.search_jobs, matcher.refine_search):
+        assert list(tool.args) == ["query"]
+        assert "conversation_id" not in tool.description
+
+
+def test_build_agent_accepts_tools():
+    agent = build_agent()
+    assert {tool.name for tool in agent.tools} == {"_search_jobs_impl", "_refine_search_impl"}
+
+
+def test_search_uses_conversation_history():
+    matcher = JobMatcher(state=InMemoryBackend())
+    seen = {}
+
+    def extract_job_params(history):
+        seen["history"] = [entry["text"] for entry in history]
+        return {}
+
+    async def search_all(query, location="Remote", params=None):
+        return {"status": "success", "jobs": []}
+
+    matcher.job_search_api.extract_job_params = extract_job_params
+    matcher.job_search_api.search_all = search_all
+    matcher.add_to_conversation("I want a job in Berlin", conversation_id="a")
+    matcher.add_to_conversation("I want a job in Paris", conversation_id="b")
+    matcher._search_jobs_impl("python developer", "a")
+
+    assert seen["history"] == ["I want a job in Berlin", "python developer"]
+    assert [entry["text"] for entry in matcher.get_conversation("b")] == ["I want a job in Paris"]
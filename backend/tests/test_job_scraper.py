@@ -0,0 +1,215 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import pytest
+from scripts.job_search import JobSearchAPI
+from scripts.job_scraper import (
+    JOB_FIELDS, JobScraper, SiteConfig, find_next_page, load_site_configs,
+    normalize_posted_date, parse_listing
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "scraper"
+
+FIELDS = {
+    "title": "a.job-title",
+    "company": ".company",
+    "location": ".location",
+    "description": ".summary",
+    "url": "a.job-title@href",
+    "salary": ".salary",
+    "posted_date": "time@datetime",
+    "job_type": ".type",
+}
+
+
+def fixture_url(name: str) -> str:
+    return (FIXTURES / name).as_uri()
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def make_site(**overrides) -> SiteConfig:
+    config = dict(name="FixtureJobs", start_url=fixture_url("listing_page1.html"),
+                  item="li.job-card", fields=FIELDS)
+    config.update(overrides)
+    return SiteConfig(**config)
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self._text = text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def text(self):
+        return self._text
+
+
+class FakeSession:
+    """Serves fixture pages for HTTP URLs and records when each was requested"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url):
+        self.requests.append((url, time.monotonic()))
+        return FakeResponse(read_fixture(self.pages[url]))
+
+
+def scrape(scraper: JobScraper):
+    return asyncio.run(scraper.scrape_all())
+
+
+def test_parse_listing_matches_search_schema():
+    site = make_site()
+    jobs = parse_listing(read_fixture("listing_page1.html"), site, "https://jobs.example.com/list")
+
+    assert [list(job) for job in jobs] == [JOB_FIELDS, JOB_FIELDS]
+    assert jobs[0] == {
+        "title": "Senior Python Developer",
+        "company": "Acme Corp",
+        "location": "Berlin",
+        "description": "Build APIs with FastAPI.",
+        "url": "https://jobs.example.com/jobs/101",
+        "salary": "$120,000 - $140,000",
+        "source": "FixtureJobs",
+        "posted_date": "2025-03-01T09:00:00+00:00",
+        "job_type": "Full-time",
+    }
+    # Absolute links are kept and missing fields fall back to the defaults
+    assert jobs[1]["url"] == "https://careers.example.org/apply/102"
+    assert jobs[1]["salary"] == "Not specified"
+    assert jobs[1]["posted_date"] == ""
+
+
+def test_display_dates_are_normalized_for_sorting():
+    site = make_site(fields={"title": "a.job-title", "posted_date": ".posted"})
+    jobs = parse_listing(read_fixture("listing_dates.html"), site, "https://jobs.example.com/")
+    dates = {job["title"]: job["posted_date"] for job in jobs}
+
+    three_days_ago = datetime.fromisoformat(dates["Backend Engineer"])
+    expected = datetime.now(timezone.utc) - timedelta(days=3)
+    assert abs(three_days_ago - expected) < timedelta(minutes=1)
+    assert dates["Site Reliability Engineer"] == "2025-03-03T00:00:00+00:00"
+    assert dates["QA Engineer"] == ""
+    assert dates["ML Engineer"] == "2025-03-01T09:00:00+00:00"
+
+    # Merged with API results using the same sort as JobSearchAPI.search_all
+    merged = jobs + [{"title": "API job", "posted_date": "2025-03-02T10:00:00.000Z"}]
+    merged.sort(key=JobSearchAPI._posted_date_key, reverse=True)
+    assert [job["title"] for job in merged] == [
+        "Backend Engineer", "Site Reliability Engineer", "API job", "ML Engineer", "QA Engineer"
+    ]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-03-01", "2025-03-01T00:00:00+00:00"),
+    ("3 Mar 2025", "2025-03-03T00:00:00+00:00"),
+    ("2025-03-01T09:00:00+02:00", "2025-03-01T07:00:00+00:00"),
+    ("yesterday", "2025-03-09T12:00:00+00:00"),
+    ("an hour ago", "2025-03-10T11:00:00+00:00"),
+    ("2 weeks ago", "2025-02-24T12:00:00+00:00"),
+    ("", ""),
+    ("soon", ""),
+])
+def test_normalize_posted_date(value, expected):
+    now = datetime(2025, 3, 10, 12, tzinfo=timezone.utc)
+    assert normalize_posted_date(value, now) == expected
+
+
+def test_site_needs_exactly_one_entry_point():
+    with pytest.raises(ValueError):
+        make_site(page_url="https://jobs.example.com/list?page={page}")
+    with pytest.raises(ValueError):
+        make_site(start_url=None)
+
+
+def test_find_next_page_resolves_relative_link():
+    site = make_site(next_page="a.next@href")
+    html = read_fixture("listing_page1.html")
+    assert find_next_page(html, site, "https://jobs.example.com/list/listing_page1.html") == \
+        "https://jobs.example.com/list/listing_page2.html"
+    assert find_next_page(html, make_site(), "https://jobs.example.com/") is None
+
+
+def test_next_page_crawl_stops_on_cycle():
+    jobs = scrape(JobScraper([make_site(next_page="a.next@href", max_pages=10)]))
+    assert [job["title"] for job in jobs] == [
+        "Senior Python Developer", "Data Engineer", "Frontend Engineer"
+    ]
+
+
+def test_next_page_crawl_stops_at_max_pages():
+    jobs = scrape(JobScraper([make_site(next_page="a.next@href", max_pages=1)]))
+    assert [job["title"] for job in jobs] == ["Senior Python Developer", "Data Engineer"]
+
+
+def test_page_template_keeps_pages_when_one_is_missing():
+    site = make_site(start_url=None, max_pages=3,
+                     page_url=fixture_url("listing_page1.html").replace("1.html", "{page}.html"))
+    jobs = scrape(JobScraper([site]))
+    assert sorted(job["title"] for job in jobs) == [
+        "Data Engineer", "Frontend Engineer", "Senior Python Developer"
+    ]
+
+
+def test_duplicate_listings_across_sites_are_dropped():
+    sites = [make_site(), make_site(name="Mirror")]
+    jobs = scrape(JobScraper(sites))
+    assert [job["source"] for job in jobs] == ["FixtureJobs", "FixtureJobs"]
+
+
+def test_fetch_works_outside_scrape_all():
+    scraper = JobScraper([], per_host_delay=0)
+    session = FakeSession({"https://jobs.example.com/1": "listing_page1.html"})
+    html = asyncio.run(scraper.fetch(session, "https://jobs.example.com/1"))
+    assert "Senior Python Developer" in html
+    assert asyncio.run(scraper.fetch(session, fixture_url("missing.html"))) is None
+
+
+def test_requests_to_one_host_are_spaced_out():
+    pages = {f"https://jobs.example.com/list?page={n}": "listing_page2.html" for n in range(1, 4)}
+    pages["https://other.example.com/list"] = "listing_page2.html"
+    scraper = JobScraper([], per_host_delay=0.1)
+    session = FakeSession(pages)
+
+    async def run():
+        await asyncio.gather(*(scraper.fetch(session, url) for url in pages))
+
+    asyncio.run(run())
+    times = sorted(t for url, t in session.requests if "jobs.example.com" in url)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert len(gaps) == 2
+    assert all(gap >= 0.09 for gap in gaps)
+    # Another host is not held back by the first one's delay
+    other = next(t for url, t in session.requests if "other.example.com" in url)
+    assert other - times[0] < 0.09
+
+
+def test_load_site_configs(tmp_path):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps([{
+        "name": "FixtureJobs",
+        "start_url": fixture_url("listing_page1.html"),
+        "item": "li.job-card",
+        "fields": FIELDS,
+        "next_page": "a.next@href",
+        "max_pages": 2,
+    }]))
+    sites = load_site_configs(str(path))
+    assert sites == [make_site(next_page="a.next@href", max_pages=2)]
+    with pytest.raises(TypeError):
+        path.write_text(json.dumps([{"name": "Incomplete"}]))
+        load_site_configs(str(path))
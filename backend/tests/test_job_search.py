@@ -0,0 +1,59 @@
+import asyncio
+from scripts.job_search import JobSearchAPI
+from utils.state_backend import InMemoryBackend
+
+JOB = {
+    "title": "Python Developer",
+    "company": "Acme",
+    "location": "Remote",
+    "description": "",
+    "url": "https://example.com/jobs/1",
+    "salary": "Not specified",
+    "source": "Remotive",
+    "posted_date": "",
+    "job_type": "Remote",
+}
+
+
+def make_api(jsearch_results, remotive_results):
+    api = JobSearchAPI(state=InMemoryBackend())
+    calls = {"jsearch": 0, "remotive": 0}
+
+    async def search_jsearch(query, location="Remote"):
+        calls["jsearch"] += 1
+        return jsearch_results()
+
+    async def search_remotive(query):
+        calls["remotive"] += 1
+        return remotive_results()
+
+    api.search_jsearch = search_jsearch
+    api.search_remotive = search_remotive
+    return api, calls
+
+
+def test_complete_results_are_cached():
+    api, calls = make_api(lambda: [], lambda: [dict(JOB)])
+    first = asyncio.run(api.search_all("python"))
+    second = asyncio.run(api.search_all("python"))
+    assert first["jobs"] == second["jobs"] == [JOB]
+    assert calls == {"jsearch": 1, "remotive": 1}
+
+
+def test_partial_results_are_not_cached():
+    api, calls = make_api(lambda: None, lambda: [dict(JOB)])
+    result = asyncio.run(api.search_all("python"))
+    asyncio.run(api.search_all("python"))
+    assert result["jobs"] == [JOB]
+    assert calls == {"jsearch": 2, "remotive": 2}
+
+
+def test_results_with_mixed_dates_are_sorted():
+    dated = [
+        dict(JOB, title="Naive", posted_date="2025-03-02T08:00:00"),
+        dict(JOB, title="Missing", posted_date="", url="https://example.com/jobs/2"),
+        dict(JOB, title="Aware", posted_date="2025-03-03T08:00:00.000Z", url="https://example.com/jobs/3"),
+    ]
+    api, _ = make_api(lambda: [], lambda: dated)
+    result = asyncio.run(api.search_all("python"))
+    assert [job["title"] for job in result["jobs"]] == ["Aware", "Naive", "Missing"]
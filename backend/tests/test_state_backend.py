@@ -0,0 +1,172 @@
+import asyncio
+import multiprocessing
+import sqlite3
+import threading
+import time
+import pytest
+from utils import state_backend
+from utils.state_backend import InMemoryBackend, SQLiteBackend, StateBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(state_backend, "time", fake)
+    return fake
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryBackend()
+    return SQLiteBackend(str(tmp_path / "state.db"))
+
+
+def test_incomplete_backend_cannot_be_created():
+    class Incomplete(StateBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_set_and_get(backend):
+    backend.set("key", {"jobs": [1, 2]})
+    assert backend.get("key") == {"jobs": [1, 2]}
+    assert backend.get("missing") is None
+
+
+def test_value_expires_after_ttl(backend, clock):
+    backend.set("key", "value", ttl=10)
+    clock.now += 9
+    assert backend.get("key") == "value"
+    clock.now += 2
+    assert backend.get("key") is None
+
+
+def test_list_keeps_order_and_newest_items(backend):
+    for i in range(5):
+        backend.append("conversation", i, max_items=3)
+    assert backend.get_list("conversation") == [2, 3, 4]
+    assert backend.get_list("other") == []
+
+
+def test_list_ttl_is_refreshed_on_append(backend, clock):
+    backend.append("conversation", "first", ttl=10)
+    clock.now += 8
+    backend.append("conversation", "second", ttl=10)
+    clock.now += 8
+    assert backend.get_list("conversation") == ["first", "second"]
+    clock.now += 3
+    assert backend.get_list("conversation") == []
+    backend.append("conversation", "third", ttl=10)
+    assert backend.get_list("conversation") == ["third"]
+
+
+def test_hit_counts_per_window(backend, clock):
+    clock.now = 600.0
+    assert [backend.hit("bucket", 60) for _ in range(3)] == [1, 2, 3]
+    assert backend.allow("bucket", 3, 60) is False
+    clock.now += 60
+    assert backend.allow("bucket", 3, 60) is True
+
+
+def test_async_wrappers(backend):
+    async def run():
+        await backend.aset("key", "value")
+        await backend.aappend("list", "item")
+        return (await backend.aget("key"), await backend.aget_list("list"),
+                await backend.aallow("bucket", 1, 60))
+
+    assert asyncio.run(run()) == ("value", ["item"], True)
+
+
+def test_sqlite_purges_expired_rows(tmp_path, clock):
+    backend = SQLiteBackend(str(tmp_path / "state.db"))
+    backend.set("search:old", "value", ttl=10)
+    backend.append("conversation:old", "message", ttl=10)
+    backend.hit("ratelimit:old", 60)
+    clock.now += state_backend.PURGE_INTERVAL + 60
+    backend.set("search:new", "value", ttl=10)
+
+    conn = sqlite3.connect(backend.path)
+    assert conn.execute("SELECT key FROM kv").fetchall() == [("search:new",)]
+    assert conn.execute("SELECT COUNT(*) FROM list_items").fetchone() == (0,)
+    assert conn.execute("SELECT COUNT(*) FROM counters").fetchone() == (0,)
+
+
+def test_sqlite_falls_back_when_write_lock_is_held(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "state.db"), busy_timeout=0.05)
+    backend.set("key", "cached")
+    blocker = sqlite3.connect(backend.path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        start = time.monotonic()
+        backend.set("key", "new")
+        assert backend.hit("bucket", 60) == 0
+        assert backend.get("key") == "cached"
+        assert time.monotonic() - start < 1
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+
+def test_sqlite_append_waits_for_write_lock(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "state.db"), busy_timeout=0.05, list_timeout=5)
+    blocker = sqlite3.connect(backend.path, isolation_level=None, check_same_thread=False)
+    blocker.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(0.3, blocker.execute, args=("ROLLBACK",))
+    release.start()
+    try:
+        backend.append("conversation", "message")
+    finally:
+        release.join()
+        blocker.close()
+    assert backend.get_list("conversation") == ["message"]
+
+
+def test_sqlite_append_raises_instead_of_dropping(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "state.db"), list_timeout=0.1)
+    blocker = sqlite3.connect(backend.path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            backend.append("conversation", "message")
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+    assert backend.get_list("conversation") == []
+
+
+def _worker(path, conversation, count):
+    backend = SQLiteBackend(path)
+    for i in range(count):
+        backend.append(conversation, i)
+        backend.hit("shared", 60)
+
+
+def test_sqlite_state_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "state.db")
+    SQLiteBackend(path)
+    processes = [
+        multiprocessing.Process(target=_worker, args=(path, f"conversation:{n}", 10))
+        for n in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    backend = SQLiteBackend(path)
+    for n in range(4):
+        assert backend.get_list(f"conversation:{n}") == list(range(10))
+    assert backend.hit("shared", 60) == 41
@@ -0,0 +1,352 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from utils.logger import get_logger
+
+# Set up logger for this module
+logger = get_logger('state_backend')
+
+# Environment variables used to pick the backend
+BACKEND_ENV = "JOBSEEKER_STATE_BACKEND"
+SQLITE_PATH_ENV = "JOBSEEKER_STATE_PATH"
+DEFAULT_SQLITE_PATH = "data/jobseeker_state.db"
+
+# How long SQLite waits for another worker's write lock. Cache and rate-limit
+# calls give up quickly and fall back; conversation history waits much longer
+# and raises rather than losing a message. Also how often expired rows are purged.
+SQLITE_BUSY_TIMEOUT = float(os.getenv("JOBSEEKER_STATE_BUSY_TIMEOUT", "0.25"))
+SQLITE_LIST_TIMEOUT = float(os.getenv("JOBSEEKER_STATE_LIST_TIMEOUT", "10"))
+PURGE_INTERVAL = 60
+
+
+class StateBackend(ABC):
+    """Shared storage for conversation history, search caches and rate limits.
+
+    Subclasses decide where the state lives. Values must be JSON serialisable
+    so every backend behaves the same way. The a-prefixed methods run the
+    blocking calls in a thread so they can be awaited from the event loop.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store value under key, optionally expiring after ttl seconds"""
+
+    @abstractmethod
+    def append(self, key: str, item: Any, max_items: Optional[int] = None,
+               ttl: Optional[float] = None):
+        """Append item to the list under key, keeping only the newest max_items.
+
+        A ttl expires the whole list ttl seconds after the last append.
+        """
+
+    @abstractmethod
+    def get_list(self, key: str) -> List[Any]:
+        """Return every item appended under key, oldest first"""
+
+    @abstractmethod
+    def hit(self, key: str, window: float) -> int:
+        """Count a hit in the current fixed window and return the total so far"""
+
+    def allow(self, key: str, limit: int, window: float) -> bool:
+        """Return True if key has made at most limit hits in the current window"""
+        return self.hit(key, window) <= limit
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None):
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def aappend(self, key: str, item: Any, max_items: Optional[int] = None,
+                      ttl: Optional[float] = None):
+        await asyncio.to_thread(self.append, key, item, max_items, ttl)
+
+    async def aget_list(self, key: str) -> List[Any]:
+        return await asyncio.to_thread(self.get_list, key)
+
+    async def aallow(self, key: str, limit: int, window: float) -> bool:
+        return await asyncio.to_thread(self.allow, key, limit, window)
+
+
+class InMemoryBackend(StateBackend):
+    """Process-local backend. Only safe with a single worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, tuple] = {}
+        self._lists: Dict[str, tuple] = {}
+        self._counters: Dict[str, tuple] = {}
+        self._last_purge = time.time()
+
+    def _maybe_purge(self, now: float):
+        """Drop expired entries; the caller must hold the lock"""
+        if now - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        for store in (self._values, self._lists, self._counters):
+            expired = [key for key, entry in store.items()
+                       if entry[-1] is not None and entry[-1] <= now]
+            for key in expired:
+                del store[key]
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._values[key]
+                return None
+            return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._maybe_purge(now)
+            self._values[key] = (json.dumps(value), expires_at)
+
+    def append(self, key: str, item: Any, max_items: Optional[int] = None,
+               ttl: Optional[float] = None):
+        now = time.time()
+        with self._lock:
+            self._maybe_purge(now)
+            items, expires_at = self._lists.get(key, ([], None))
+            if expires_at is not None and expires_at <= now:
+                items = []
+            items.append(json.dumps(item))
+            if max_items:
+                items = items[-max_items:]
+            self._lists[key] = (items, now + ttl if ttl else None)
+
+    def get_list(self, key: str) -> List[Any]:
+        with self._lock:
+            items, expires_at = self._lists.get(key, ([], None))
+            if expires_at is not None and expires_at <= time.time():
+                return []
+            return [json.loads(item) for item in items]
+
+    def hit(self, key: str, window: float) -> int:
+        now = time.time()
+        current = int(now // window)
+        with self._lock:
+            self._maybe_purge(now)
+            bucket, count, _ = self._counters.get(key, (current, 0, None))
+            count = count + 1 if bucket == current else 1
+            self._counters[key] = (current, count, (current + 1) * window)
+            return count
+
+
+class SQLiteBackend(StateBackend):
+    """Backend stored in a SQLite file so several worker processes can share it.
+
+    Cache and rate-limit calls wait at most busy_timeout seconds for the
+    write lock; if another worker holds it longer, reads miss, writes are
+    skipped and rate limits fail open. List calls hold conversation history,
+    so they wait up to list_timeout seconds and raise instead of dropping it.
+    """
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH, busy_timeout: float = SQLITE_BUSY_TIMEOUT,
+                 list_timeout: float = SQLITE_LIST_TIMEOUT):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.list_timeout = list_timeout
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._last_purge = 0.0
+        self._init_schema()
+
+    def _connect(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """Return a connection owned by the current thread and process.
+
+        timeout sets how long the connection waits for locks, defaulting to
+        busy_timeout.
+        """
+        timeout = self.busy_timeout if timeout is None else timeout
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._local.timeout = timeout
+        elif self._local.timeout != timeout:
+            conn.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+            self._local.timeout = timeout
+        return conn
+
+    def _init_schema(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS kv (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_kv_expires ON kv (expires_at);
+                CREATE TABLE IF NOT EXISTS list_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_list_items_key ON list_items (key, id);
+                CREATE INDEX IF NOT EXISTS idx_list_items_expires ON list_items (expires_at);
+                CREATE TABLE IF NOT EXISTS counters (
+                    key TEXT PRIMARY KEY,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+            """)
+        finally:
+            conn.close()
+
+    def _write(self, statements: List[tuple], action: str, wait: bool = False) -> bool:
+        """Run statements in one write transaction.
+
+        By default a busy lock skips the write and returns False. With wait,
+        the lock is awaited for list_timeout and a timeout raises.
+        """
+        conn = self._connect(self.list_timeout if wait else None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if wait:
+                logger.error(f"State backend busy, could not {action}: {e}")
+                raise
+            logger.warning(f"State backend busy, skipping {action}: {e}")
+            return False
+        try:
+            for sql, args in statements:
+                conn.execute(sql, args)
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _purge_statements(self, now: float) -> List[tuple]:
+        """Return delete statements for expired rows, at most once per PURGE_INTERVAL"""
+        if now - self._last_purge < PURGE_INTERVAL:
+            return []
+        self._last_purge = now
+        return [
+            ("DELETE FROM kv WHERE expires_at <= ?", (now,)),
+            ("DELETE FROM list_items WHERE expires_at <= ?", (now,)),
+            ("DELETE FROM counters WHERE expires_at <= ?", (now,)),
+        ]
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"State backend busy, treating {key} as missing: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        self._write(self._purge_statements(now) + [(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), expires_at)
+        )], f"set {key}")
+
+    def append(self, key: str, item: Any, max_items: Optional[int] = None,
+               ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        statements = self._purge_statements(now) + [
+            # Expired items would otherwise reappear when the TTL is refreshed
+            ("DELETE FROM list_items WHERE key = ? AND expires_at <= ?", (key, now)),
+            ("INSERT INTO list_items (key, value, expires_at) VALUES (?, ?, ?)",
+             (key, json.dumps(item), expires_at)),
+            ("UPDATE list_items SET expires_at = ? WHERE key = ?", (expires_at, key)),
+        ]
+        if max_items:
+            statements.append((
+                "DELETE FROM list_items WHERE key = ? AND id NOT IN "
+                "(SELECT id FROM list_items WHERE key = ? ORDER BY id DESC LIMIT ?)",
+                (key, key, max_items)
+            ))
+        self._write(statements, f"append to {key}", wait=True)
+
+    def get_list(self, key: str) -> List[Any]:
+        rows = self._connect(self.list_timeout).execute(
+            "SELECT value FROM list_items WHERE key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?) ORDER BY id",
+            (key, time.time())
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def hit(self, key: str, window: float) -> int:
+        now = time.time()
+        current = int(now // window)
+        conn = self._connect()
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent workers
+        # cannot both read the same count before either writes it back
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"State backend busy, not counting hit for {key}: {e}")
+            return 0
+        try:
+            for sql, args in self._purge_statements(now):
+                conn.execute(sql, args)
+            row = conn.execute(
+                "SELECT bucket, count FROM counters WHERE key = ?", (key,)
+            ).fetchone()
+            count = row[1] + 1 if row and row[0] == current else 1
+            conn.execute(
+                "INSERT OR REPLACE INTO counters (key, bucket, count, expires_at) VALUES (?, ?, ?, ?)",
+                (key, current, count, (current + 1) * window)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+
+_backend: Optional[StateBackend] = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name: Optional[str] = None) -> StateBackend:
+    """Create a backend by name ('memory' or 'sqlite'), defaulting to the environment"""
+    name = (name or os.getenv(BACKEND_ENV, "memory")).lower()
+    if name == "memory":
+        return InMemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend(os.getenv(SQLITE_PATH_ENV, DEFAULT_SQLITE_PATH))
+    raise ValueError(f"Unknown state backend: {name}")
+
+
+def get_backend() -> StateBackend:
+    """Return the process-wide backend, creating it on first use"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+                logger.info(f"Using state backend: {type(_backend).__name__}")
+    return _backend
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import { Input, Button, Avatar } from 'antd';
 import { SendOutlined, RobotOutlined, UserOutlined } from '@ant-design/icons';
 import './App.css';
@@ -7,6 +7,8 @@ import { Message } from './types';
 function App() {
   const [message, setMessage] = useState('');
   const [messages, setMessages] = useState<Message[]>([]);
+  // Assigned by the backend on the first reply and reused for the session
+  const conversationId = useRef<string | null>(null);
 
   const handleSend = async () => {
     if (!message.trim()) return;
@@ -30,7 +32,7 @@ function App() {
         },
         body: JSON.stringify({ 
           message: message,
-          conversation_id: 'default'
+          conversation_id: conversationId.current
         }),
       });
       
@@ -40,6 +42,9 @@ function App() {
       
       const data = await response.json();
       console.log('Received response from backend:', data);
+      if (data.conversation_id) {
+        conversationId.current = data.conversation_id;
+      }
       
       const aiMessage: Message = {
         text: data.response,